@@ -0,0 +1,251 @@
+/*
+ * Optional accelerator for arpy, parsing a single ar member header in C.
+ *
+ * arpy works without it: when this module can't be imported, the pure
+ * Python parser in arpy.py is used instead. Both are expected to agree on
+ * every header they accept.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* must match the HEADER_* constants in arpy.py */
+#define HEADER_BSD 1
+#define HEADER_GNU 2
+#define HEADER_GNU_TABLE 3
+#define HEADER_GNU_SYMBOLS 4
+#define HEADER_NORMAL 5
+
+#define HEADER_LEN 60
+
+#define NAME_OFFSET 0
+#define NAME_LEN 16
+#define TIMESTAMP_OFFSET 16
+#define TIMESTAMP_LEN 12
+#define UID_OFFSET 28
+#define UID_LEN 6
+#define GID_OFFSET 34
+#define GID_LEN 6
+#define MODE_OFFSET 40
+#define MODE_LEN 8
+#define SIZE_OFFSET 48
+#define SIZE_LEN 10
+#define MAGIC_OFFSET 58
+
+static int
+is_space(char c)
+{
+	/* the same set as bytes.strip() */
+	return c == ' ' || c == '\t' || c == '\n' || c == '\r' || c == '\v' || c == '\f';
+}
+
+/*
+ * Parses a whitespace padded ASCII number. Returns 1 for a blank field, 0 for
+ * a number stored in *value, or 2 if the field holds anything but digits.
+ */
+static int
+parse_number(const char *field, Py_ssize_t len, int base, long long *value)
+{
+	Py_ssize_t start = 0, end = len, i;
+	long long result = 0;
+
+	while (start < end && is_space(field[start]))
+		start++;
+	while (end > start && is_space(field[end - 1]))
+		end--;
+	if (start == end)
+		return 1;
+
+	for (i = start; i < end; i++) {
+		int digit = field[i] - '0';
+		if (digit < 0 || digit >= base)
+			return 2;
+		result = result * base + digit;
+	}
+	*value = result;
+	return 0;
+}
+
+/*
+ * Converts the field with int(field, base), so that signs, underscores and
+ * errors are handled exactly like the Python parser does.
+ */
+static PyObject *
+int_field(const char *field, Py_ssize_t len, int base)
+{
+	return PyObject_CallFunction((PyObject *)&PyLong_Type, "y#i", field, len, base);
+}
+
+/* Same as parse_number, but a blank field is an error. */
+static PyObject *
+number_field(const char *field, Py_ssize_t len, int base)
+{
+	long long value = 0;
+
+	if (parse_number(field, len, base, &value) != 0)
+		return int_field(field, len, base);
+	return PyLong_FromLongLong(value);
+}
+
+/* Same as parse_number, but a blank field gives None. */
+static PyObject *
+optional_number_field(const char *field, Py_ssize_t len)
+{
+	long long value = 0;
+	int status = parse_number(field, len, 10, &value);
+
+	if (status == 1)
+		Py_RETURN_NONE;
+	if (status == 2)
+		return int_field(field, len, 10);
+	return PyLong_FromLongLong(value);
+}
+
+static int
+header_type(const char *name)
+{
+	Py_ssize_t start = 0, end = NAME_LEN;
+
+	if (name[0] == '/') {
+		if (name[1] == '/')
+			return HEADER_GNU_TABLE;
+		for (start = 1; start < NAME_LEN; start++) {
+			if (!is_space(name[start]))
+				return HEADER_GNU;
+		}
+		return HEADER_GNU_SYMBOLS;
+	}
+	if (name[0] == '#' && name[1] == '1' && name[2] == '/')
+		return HEADER_BSD;
+	if (is_space(name[0])) {
+		while (start < end && is_space(name[start]))
+			start++;
+		while (end > start && is_space(name[end - 1]))
+			end--;
+		if (end - start == 1 && name[start] == '/')
+			return HEADER_GNU_SYMBOLS;
+	}
+	return HEADER_NORMAL;
+}
+
+PyDoc_STRVAR(parse_header_doc,
+"parse_header(header, offset) -> tuple or None\n\n"
+"Parses a 60 byte ar member header found at the given archive offset.\n"
+"Returns (type, name, size, timestamp, uid, gid, mode, file_offset), or None\n"
+"if the header magic doesn't match. Raises ValueError on malformed numbers.\n"
+"Timestamp, uid, gid and mode are None for special data segments.");
+
+static PyObject *
+parse_header(PyObject *self, PyObject *args)
+{
+	Py_buffer buffer;
+	Py_ssize_t offset;
+	const char *header;
+	Py_ssize_t name_end;
+	int type;
+	PyObject *size = NULL, *timestamp = NULL, *uid = NULL, *gid = NULL, *mode = NULL;
+	PyObject *name = NULL, *file_offset = NULL, *result = NULL;
+
+	if (!PyArg_ParseTuple(args, "y*n:parse_header", &buffer, &offset))
+		return NULL;
+
+	if (buffer.len != HEADER_LEN) {
+		PyErr_SetString(PyExc_ValueError, "header must be exactly 60 bytes long");
+		goto done;
+	}
+	header = (const char *)buffer.buf;
+
+	if (header[MAGIC_OFFSET] != '\x60' || header[MAGIC_OFFSET + 1] != '\x0a') {
+		result = Py_None;
+		Py_INCREF(result);
+		goto done;
+	}
+
+	type = header_type(header + NAME_OFFSET);
+
+	size = number_field(header + SIZE_OFFSET, SIZE_LEN, 10);
+	if (size == NULL)
+		goto done;
+
+	if (type == HEADER_NORMAL || type == HEADER_BSD || type == HEADER_GNU) {
+		timestamp = number_field(header + TIMESTAMP_OFFSET, TIMESTAMP_LEN, 10);
+		if (timestamp == NULL)
+			goto done;
+		uid = optional_number_field(header + UID_OFFSET, UID_LEN);
+		if (uid == NULL)
+			goto done;
+		gid = optional_number_field(header + GID_OFFSET, GID_LEN);
+		if (gid == NULL)
+			goto done;
+		mode = number_field(header + MODE_OFFSET, MODE_LEN, 8);
+		if (mode == NULL)
+			goto done;
+	} else {
+		timestamp = Py_None;
+		uid = Py_None;
+		gid = Py_None;
+		mode = Py_None;
+		Py_INCREF(Py_None);
+		Py_INCREF(Py_None);
+		Py_INCREF(Py_None);
+		Py_INCREF(Py_None);
+	}
+
+	/* same as name.rstrip(), followed by .rstrip(b'/') for longer names */
+	name_end = NAME_LEN;
+	while (name_end > 0 && is_space(header[NAME_OFFSET + name_end - 1]))
+		name_end--;
+	if (name_end > 1) {
+		while (name_end > 0 && header[NAME_OFFSET + name_end - 1] == '/')
+			name_end--;
+	}
+	name = PyBytes_FromStringAndSize(header + NAME_OFFSET, name_end);
+	if (name == NULL)
+		goto done;
+
+	if (type == HEADER_NORMAL) {
+		file_offset = PyLong_FromSsize_t(offset + HEADER_LEN);
+		if (file_offset == NULL)
+			goto done;
+	} else {
+		file_offset = Py_None;
+		Py_INCREF(Py_None);
+	}
+
+	result = Py_BuildValue("(iOOOOOOO)", type, name, size, timestamp, uid, gid,
+			mode, file_offset);
+
+done:
+	Py_XDECREF(size);
+	Py_XDECREF(timestamp);
+	Py_XDECREF(uid);
+	Py_XDECREF(gid);
+	Py_XDECREF(mode);
+	Py_XDECREF(name);
+	Py_XDECREF(file_offset);
+	PyBuffer_Release(&buffer);
+	return result;
+}
+
+static PyMethodDef arpy_native_methods[] = {
+	{"parse_header", parse_header, METH_VARARGS, parse_header_doc},
+	{NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef arpy_native_module = {
+	PyModuleDef_HEAD_INIT,
+	"_arpy_native",
+	"Optional C accelerator for arpy header parsing",
+	-1,
+	arpy_native_methods,
+	NULL,
+	NULL,
+	NULL,
+	NULL
+};
+
+PyMODINIT_FUNC
+PyInit__arpy_native(void)
+{
+	return PyModule_Create(&arpy_native_module);
+}
@@ -49,9 +49,15 @@ f.read([length])
 
 random access through seek and tell functions is supported on the archived files.
 
+Archives opened with arpy.Archive('some_ar_file', use_mmap=True) are memory-mapped,
+so their files can also be read without copying through:
+f.read_memoryview([length])
+The same works for archives opened from an mmap or BytesIO object.
+
 zipfile-like interface is also available:
 
 ar.namelist() will return a list of names (with possible duplicates)
+ar.iter_headers() will yield the headers, reading them only as needed
 ar.infolist() will return a list of headers
 
 Use ar.open(name / header) to get the specific file.
@@ -60,9 +66,18 @@ You can also use context manager syntax with either the ar file or its contents.
 """
 
 import io
+import mmap
 import struct
+import os
 import os.path
-from typing import Optional, List, Dict, BinaryIO, cast, Union
+import stat
+from typing import Optional, List, Dict, BinaryIO, Iterable, Iterator, Mapping, cast, Union
+
+try:
+	# optional C accelerator, see _arpy_native.c
+	from _arpy_native import parse_header as _native_parse_header # type: ignore
+except ImportError:
+	_native_parse_header = None
 
 
 HEADER_BSD = 1
@@ -75,9 +90,18 @@ HEADER_TYPES = {
 		HEADER_GNU: 'GNU', HEADER_GNU_TABLE: 'GNU_TABLE',
 		HEADER_GNU_SYMBOLS: 'GNU_SYMBOLS',
 		HEADER_NORMAL: 'NORMAL'}
+# headers describing archived files, as opposed to special data segments
+_FILE_HEADER_TYPES = frozenset((HEADER_BSD, HEADER_GNU, HEADER_NORMAL))
 
 GLOBAL_HEADER_LEN = 8
 HEADER_LEN = 60
+_SKIP_CHUNK_LEN = 65536
+_WINDOW_MIN_LEN = 4096
+_WINDOW_MAX_LEN = 1 << 20
+
+# name, file attributes (timestamp, uid, gid, mode), size, magic
+_AR_HEADER = struct.Struct("16s 32s 10s 2s")
+_AR_HEADER_ATTRIBUTES = struct.Struct("12s 6s 6s 8s")
 
 class ArchiveFormatError(Exception):
 	""" Raised on problems with parsing the archive headers """
@@ -89,43 +113,57 @@ class ArchiveAccessError(IOError):
 class ArchiveFileHeader(object):
 	""" File header of an archived file, or a special data segment """
 
-	def __init__(self, header: bytes, offset: int) -> None:
-		""" Creates a new header from binary data starting at a specified offset """
+	__slots__ = ('type', 'size', 'offset', 'name', 'proxy_name', 'file_offset',
+			'_attributes', '_timestamp', '_uid', '_gid', '_mode')
+
+	def __init__(self, header: Union[bytes, bytearray, memoryview], offset: int) -> None:
+		"""
+		Creates a new header from binary data starting at a specified offset
+
+		Only the fields needed to walk the archive are converted here. Timestamp,
+		uid, gid and mode are converted on the first access when they hold only
+		digits and spaces, and right away otherwise, so that bad values still
+		fail here. If the optional _arpy_native module is built, all fields are
+		converted upfront instead. Both accept the same numbers as int(). A
+		malformed number raises ValueError or ArchiveFormatError,
+		which the archive reports as ArchiveFormatError.
+		"""
+
+		if len(header) != HEADER_LEN:
+			raise ArchiveFormatError("file header too short")
+		if _native_parse_header is not None:
+			self.__init_native(header, offset)
+			return
 
-		name, timestamp, uid, gid, mode, size, magic = struct.unpack(
-				"16s 12s 6s 6s 8s 10s 2s", header)
+		name, attributes, size, magic = _AR_HEADER.unpack_from(header, 0)
 		if magic != b"\x60\x0a":
 			raise ArchiveFormatError("file header magic doesn't match")
 
-		if name.startswith(b"#1/"):
+		# most members have plain names, so rule the special ones out first
+		lead = name[:1]
+		if lead == b"/":
+			if name[1:2] == b"/":
+				self.type = HEADER_GNU_TABLE
+			elif name.rstrip() == b"/":
+				self.type = HEADER_GNU_SYMBOLS
+			else:
+				self.type = HEADER_GNU
+		elif lead == b"#" and name.startswith(b"#1/"):
 			self.type = HEADER_BSD
-		elif name.startswith(b"//"):
-			self.type = HEADER_GNU_TABLE
-		elif name.strip() == b"/":
+		elif lead.isspace() and name.strip() == b"/":
 			self.type = HEADER_GNU_SYMBOLS
-		elif name.startswith(b"/"):
-			self.type = HEADER_GNU
 		else:
 			self.type = HEADER_NORMAL
 
-		try:
-			self.size = int(size)
-
-			if self.type in (HEADER_NORMAL, HEADER_BSD, HEADER_GNU):
-				self.timestamp = int(timestamp)
-				if uid.strip():
-					self.uid = cast(Optional[int], int(uid))
-				else:
-					self.uid = None
-				if gid.strip():
-					self.gid = cast(Optional[int], int(gid))
-				else:
-					self.gid = None
-				self.mode = int(mode, 8)
+		self.size = int(size)
 
-		except ValueError as err:
-			raise ArchiveFormatError(
-					"cannot convert file header fields to integers", err)
+		if self.type in _FILE_HEADER_TYPES:
+			self._attributes = attributes
+			if attributes.translate(None, b"0123456789 "):
+				# signs or unusual padding, convert now so that bad values fail here
+				self.__parse_attributes()
+		else:
+			self._attributes = None
 
 		self.offset = offset
 		name = name.rstrip()
@@ -140,6 +178,67 @@ class ArchiveFileHeader(object):
 			self.proxy_name = name
 			self.file_offset = None
 
+	def __init_native(self, header: Union[bytes, bytearray, memoryview], offset: int) -> None:
+		""" Fills in all the fields at once, using the C parser """
+		parsed = _native_parse_header(header, offset)
+		if parsed is None:
+			raise ArchiveFormatError("file header magic doesn't match")
+
+		header_type, name, self.size, timestamp, uid, gid, mode, self.file_offset = parsed
+		self.type = header_type
+		self.offset = offset
+		self._attributes = None
+		if header_type in _FILE_HEADER_TYPES:
+			self._timestamp = timestamp
+			self._uid = uid
+			self._gid = gid
+			self._mode = mode
+
+		if header_type == HEADER_NORMAL:
+			self.name = name
+		else:
+			self.name = None
+			self.proxy_name = name
+
+	def __parse_attributes(self) -> None:
+		""" Converts the timestamp, uid, gid and mode fields on first access """
+		timestamp, uid, gid, mode = _AR_HEADER_ATTRIBUTES.unpack(self._attributes)
+		try:
+			self._timestamp = int(timestamp)
+			uid = uid.strip()
+			gid = gid.strip()
+			self._uid = cast(Optional[int], int(uid) if uid else None)
+			self._gid = cast(Optional[int], int(gid) if gid else None)
+			self._mode = int(mode, 8)
+		except ValueError as err:
+			raise ArchiveFormatError(
+					"cannot convert file header fields to integers", err)
+		self._attributes = None
+
+	@property
+	def timestamp(self) -> int:
+		if self._attributes is not None:
+			self.__parse_attributes()
+		return self._timestamp
+
+	@property
+	def uid(self) -> Optional[int]:
+		if self._attributes is not None:
+			self.__parse_attributes()
+		return self._uid
+
+	@property
+	def gid(self) -> Optional[int]:
+		if self._attributes is not None:
+			self.__parse_attributes()
+		return self._gid
+
+	@property
+	def mode(self) -> int:
+		if self._attributes is not None:
+			self.__parse_attributes()
+		return self._mode
+
 	def __repr__(self) -> str:
 		""" Creates a human-readable summary of a header """
 		return '''<ArchiveFileHeader: "%s" type:%s size:%i>''' % (self.name,
@@ -158,19 +257,71 @@ class ArchiveFileData(io.IOBase):
 
 	def read(self, size: Optional[int] = None) -> bytes:
 		""" Reads the data from the archived file, simulates file.read """
-		if size is None:
-			size = self.header.size
+		header = self.header
+		arobj = self.arobj
+		last_offset = self.last_offset
+		remaining = header.size - last_offset
+		if size is None or size < 0 or size > remaining:
+			size = remaining
+
+		start = cast(int, header.file_offset) + last_offset
+		mm = arobj._mm
+		if mm is not None:
+			data = mm[start:start + size]
+		elif arobj._fd is not None:
+			data = arobj._pread(size, start)
+		else:
+			arobj._seek(start)
+			data = arobj._read(size)
+		if len(data) < size:
+			raise ArchiveAccessError("incorrect archive file")
+
+		self.last_offset = last_offset + size
+		return data
 
-		if self.header.size < self.last_offset + size:
+	def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+		""" Reads the data from the archived file into the buffer, simulates file.readinto """
+		view = memoryview(buffer).cast('B')
+		size = min(len(view), self.header.size - self.last_offset)
+		start = cast(int, self.header.file_offset) + self.last_offset
+		arobj = self.arobj
+		mm = arobj._mm
+		if mm is not None:
+			if len(mm) < start + size:
+				raise ArchiveAccessError("incorrect archive file")
+			view[:size] = memoryview(mm)[start:start + size]
+		elif arobj._fd is not None:
+			if arobj._preadinto(view[:size], start) < size:
+				raise ArchiveAccessError("incorrect archive file")
+		else:
+			arobj._seek(start)
+			if arobj._readinto_full(view[:size]) < size:
+				raise ArchiveAccessError("incorrect archive file")
+
+		self.last_offset += size
+		return size
+
+	def read_memoryview(self, size: Optional[int] = None) -> memoryview:
+		"""
+		Reads the data from the archived file as a memoryview
+
+		If the archive is memory-mapped, or was opened from an mmap or BytesIO
+		object, the view points straight into that memory and no data is copied.
+		Otherwise this is the same as wrapping .read().
+		"""
+		view = self.arobj._archive_view()
+		if view is None:
+			return memoryview(self.read(size))
+
+		if size is None or size < 0 or self.header.size < self.last_offset + size:
 			size = self.header.size - self.last_offset
 
-		self.arobj._seek(cast(int, self.header.file_offset) + self.last_offset)
-		data = self.arobj._read(size)
-		if len(data) < size:
+		start = cast(int, self.header.file_offset) + self.last_offset
+		if len(view) < start + size:
 			raise ArchiveAccessError("incorrect archive file")
 
 		self.last_offset += size
-		return data
+		return view[start:start + size]
 
 	def tell(self) -> int:
 		""" Returns the position in archived file, simulates file.tell """
@@ -206,28 +357,136 @@ class ArchiveFileDataThin(ArchiveFileData):
 	""" File-like object used for reading a thin archived file """
 
 	def __init__(self, ar_obj: "Archive", header: ArchiveFileHeader) -> None:
-				ArchiveFileData.__init__(self, ar_obj, header)
-				self.file_path=os.path.dirname(ar_obj.file.name)+ "/"+header.name.decode()
-
+		ArchiveFileData.__init__(self, ar_obj, header)
+		if ar_obj._thin_dir is None:
+			raise ArchiveAccessError("cannot locate thin archive members without the archive's path")
+		self.file_path = os.path.join(ar_obj._thin_dir, header.name.decode())
+		# opened on the first read and kept until the end of the member is read
+		self._member_file = cast(Optional[BinaryIO], None)
 
 	def read(self, size: Optional[int] = None) -> bytes:
 		""" Reads the data from the archived file, simulates file.read """
-		if size is None:
-			size = self.header.size - self.last_offset
+		remaining = self.header.size - self.last_offset
+		if size is None or size < 0 or size > remaining:
+			size = remaining
+		if size <= 0:
+			return b""
 
-		with open(self.file_path, "rb") as f:
-			f.seek(self.last_offset)
-			data=f.read(size)
+		if self._member_file is None:
+			self._member_file = open(self.file_path, "rb")
+		self._member_file.seek(self.last_offset)
+		data = self._member_file.read(size)
 
 		if len(data) < size:
 			raise ArchiveAccessError("incorrect archive file")
-		self.last_offset += size
+		self.__advance(size)
 		return data
 
+	def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+		""" Reads the data from the archived file into the buffer, simulates file.readinto """
+		view = memoryview(buffer).cast('B')
+		size = min(len(view), self.header.size - self.last_offset)
+		if size == 0:
+			return 0
+
+		if self._member_file is None:
+			self._member_file = open(self.file_path, "rb")
+		self._member_file.seek(self.last_offset)
+		if self._member_file.readinto(view[:size]) < size:
+			raise ArchiveAccessError("incorrect archive file")
+		self.__advance(size)
+		return size
+
+	def __advance(self, size: int) -> None:
+		self.last_offset += size
+		if self.last_offset >= self.header.size:
+			# fully read, don't hold a descriptor for every member of the archive
+			self._close_member_file()
+
+	def _close_member_file(self) -> None:
+		if self._member_file is not None:
+			self._member_file.close()
+			self._member_file = None
+
+	def close(self) -> None:
+		""" Closes the external member file, if it was opened """
+		self._close_member_file()
+		ArchiveFileData.close(self)
+
+	def __exit__(self, _exc_type, _exc_value, _traceback):
+		# the object stays usable, it will reopen the file when read again
+		self._close_member_file()
+		return False
+
+class _LazyProxyMap(Mapping[bytes, ArchiveFileData]):
+	"""
+	Read-only mapping of names to archived files, creating the file objects on demand
+
+	Each name gets a single file object, created on the first lookup and reused
+	afterwards, the same as a prebuilt dict would behave. The name index itself
+	is only built from the archive headers when the mapping is first used.
+	"""
+
+	def __init__(self, ar_obj: "Archive") -> None:
+		self._ar = ar_obj
+		self._headers = cast(Dict[bytes, ArchiveFileHeader], {})
+		self._indexed = 0
+		self._files = cast(Dict[bytes, ArchiveFileData], {})
+
+	def _index(self) -> Dict[bytes, ArchiveFileHeader]:
+		""" Adds the headers read since the last use, returns the name index """
+		headers = self._ar.headers
+		if self._indexed < len(headers):
+			index = self._headers
+			names = []
+			for header in headers[self._indexed:]:
+				if header.type in _FILE_HEADER_TYPES:
+					name = cast(bytes, header.name)
+					index[name] = header
+					names.append(name)
+			self._indexed = len(headers)
+			# later files replace earlier ones of the same name
+			files = self._files
+			for name in names:
+				ar_file = files.get(name)
+				if ar_file is not None and ar_file.header is not index[name]:
+					del files[name]
+		return self._headers
+
+	def _open_added(self, header: ArchiveFileHeader) -> ArchiveFileData:
+		""" Returns the file object for the header just read """
+		ar_file = self._ar.file_data_class(self._ar, header)
+		self._files[cast(bytes, header.name)] = ar_file
+		return ar_file
+
+	def __getitem__(self, name: bytes) -> ArchiveFileData:
+		index = self._index()
+		ar_file = self._files.get(name)
+		if ar_file is None:
+			ar_file = self._ar.file_data_class(self._ar, index[name])
+			self._files[name] = ar_file
+		return ar_file
+
+	def __iter__(self) -> Iterator[bytes]:
+		return iter(self._index())
+
+	def __len__(self) -> int:
+		return len(self._index())
+
+	def __contains__(self, name: object) -> bool:
+		return name in self._index()
+
 class Archive(object):
 	""" Archive object allowing reading of *.ar files """
 
-	def __init__(self, filename: Optional[str] = None, fileobj: Optional[BinaryIO] = None) -> None:
+	def __init__(self, filename: Optional[str] = None, fileobj: Optional[BinaryIO] = None,
+			use_mmap: bool = False) -> None:
+		"""
+		Opens the archive from a file name or an already open binary file object
+
+		With use_mmap, regular archive files are memory-mapped, so that archived
+		files can be read without copying through .read_memoryview().
+		"""
 		self.headers = cast(List[ArchiveFileHeader], [])
 		if fileobj:
 			self.file = fileobj
@@ -237,18 +496,49 @@ class Archive(object):
 			raise ValueError("either filename or fileobj argument needs to be given")
 		self.position = 0
 		self.reached_eof = False
+		self._hdr_buf = bytearray(HEADER_LEN)
+		self._hdr_mv = memoryview(self._hdr_buf)
+		self._mm = cast(Optional[mmap.mmap], None)
+		self._skip_mv = cast(Optional[memoryview], None)
+		# read-ahead window over seekable archives, see _read_at()
+		self._window_mv = memoryview(bytearray(0))
+		self._window_offset = 0
+		self._window_len = 0
+		self._window_fill = _WINDOW_MIN_LEN
 		self._detect_seekable()
-		global_header=self._read(GLOBAL_HEADER_LEN)
+		self._detect_fileno()
+		self._bind_file_methods()
+		# the first file header is read together with the global header
+		self._prefetched_first_header = cast(Optional[memoryview], None)
+		if self.seekable:
+			global_header = self._read_at(0, GLOBAL_HEADER_LEN).tobytes()
+		else:
+			prefetch = memoryview(bytearray(GLOBAL_HEADER_LEN + HEADER_LEN))
+			prefetch = prefetch[:self._readinto_full(prefetch)]
+			global_header = prefetch[:GLOBAL_HEADER_LEN].tobytes()
+			self._prefetched_first_header = prefetch[GLOBAL_HEADER_LEN:]
 		if global_header == b"!<arch>\n":
 			self.file_data_class = ArchiveFileData
 		elif global_header == b"!<thin>\n":
 			self.file_data_class = ArchiveFileDataThin
+			# member paths are relative to the archive
+			archive_path = getattr(self.file, 'name', None)
+			if isinstance(archive_path, str):
+				self._thin_dir = cast(Optional[str], os.path.dirname(archive_path))
+			else:
+				self._thin_dir = None
 		else:
 			raise ArchiveFormatError("file is missing the global header")
+		# thin archives only hold headers, the data lives in external files
+		if use_mmap and self.file_data_class is ArchiveFileData:
+			self._map_file()
+		self._advise_sequential()
 
 		self.next_header_offset = GLOBAL_HEADER_LEN
-		self.gnu_table = cast(Dict[int,bytes], {})
-		self.archived_files = cast(Dict[bytes,ArchiveFileData], {})
+		# GNU names table, kept as one buffer with the end of each name by its offset
+		self._gnu_names = cast(Union[bytes, memoryview], b"")
+		self._gnu_name_ends = cast(Dict[int,int], {})
+		self.archived_files = _LazyProxyMap(self)
 
 	def _detect_seekable(self) -> None:
 		if hasattr(self.file, 'seekable'):
@@ -261,30 +551,231 @@ class Archive(object):
 			except Exception:
 				self.seekable = False
 
+	def _reads_descriptor_directly(self) -> bool:
+		"""
+		Checks if the archive bytes are the bytes of the file's descriptor
+
+		Wrappers like gzip.GzipFile return the descriptor of the underlying
+		compressed file from fileno(), so only plain (buffered) files qualify.
+		"""
+		raw = self.file
+		if isinstance(raw, (io.BufferedReader, io.BufferedRandom)):
+			raw = raw.raw
+		return isinstance(raw, io.FileIO)
+
+	def _detect_fileno(self) -> None:
+		""" Finds a descriptor usable for positional reads, if there is one """
+		self._fd = cast(Optional[int], None)
+		if self.seekable and hasattr(os, 'pread') and self._reads_descriptor_directly():
+			try:
+				self._fd = self.file.fileno()
+			except (OSError, ValueError):
+				# closed or detached files don't have a descriptor
+				pass
+
+	def _archive_view(self) -> Optional[memoryview]:
+		""" Returns a view of the whole archive, if it's already available in memory """
+		if self.file_data_class is not ArchiveFileData or not self.seekable:
+			# thin members live elsewhere, and streams can't go back
+			return None
+		if self._mm is not None:
+			return memoryview(self._mm)
+		if isinstance(self.file, mmap.mmap):
+			return memoryview(self.file)
+		if isinstance(self.file, io.BytesIO):
+			return self.file.getbuffer()
+		return None
+
+	def _pread(self, length: int, offset: int) -> bytes:
+		""" Reads data at a given offset without moving the file position """
+		fd = cast(int, self._fd)
+		data = os.pread(fd, length, offset)
+		while 0 < len(data) < length:
+			# a single read stops short of very large lengths on some platforms
+			more = os.pread(fd, length - len(data), offset + len(data))
+			if not more:
+				break
+			data += more
+		return data
+
+	def _preadinto(self, buffer: memoryview, offset: int) -> int:
+		""" Fills the buffer with data at a given offset without moving the file position """
+		if not hasattr(os, 'preadv'):
+			data = self._pread(len(buffer), offset)
+			buffer[:len(data)] = data
+			return len(data)
+		fd = cast(int, self._fd)
+		count = os.preadv(fd, [buffer], offset)
+		while 0 < count < len(buffer):
+			more = os.preadv(fd, [buffer[count:]], offset + count)
+			if not more:
+				break
+			count += more
+		return count
+
+	def _bind_file_methods(self) -> None:
+		""" Looks up the file methods once, instead of on every read and seek """
+		self._file_read = self.file.read
+		self._file_readinto = getattr(self.file, 'readinto', None)
+		if self.seekable:
+			self._file_seek = self.file.seek
+			self._file_tell = self.file.tell
+
+	def _map_file(self) -> None:
+		""" Memory-maps the archive file if it's backed by a regular file """
+		if not self.seekable or not self._reads_descriptor_directly():
+			return
+		try:
+			self._mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		except (OSError, ValueError):
+			# no descriptor, or a file which can't be mapped (empty, special, ...)
+			pass
+
+	def _advise_sequential(self) -> None:
+		""" Lets the OS know the headers are going to be read front to back """
+		if self._fd is not None and hasattr(os, 'posix_fadvise'):
+			try:
+				os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+			except OSError:
+				# only a hint, some file systems don't support it
+				pass
+		if self._mm is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+			try:
+				self._mm.madvise(mmap.MADV_SEQUENTIAL)
+			except OSError:
+				pass
+
+	def _advise_thin_members(self, headers: List[ArchiveFileHeader]) -> None:
+		""" Lets the OS start reading the external files of thin archive members """
+		if self._thin_dir is None or not hasattr(os, 'posix_fadvise'):
+			return
+		for header in headers:
+			if header.type not in _FILE_HEADER_TYPES:
+				continue
+			try:
+				# non-blocking, so that a member which is a FIFO doesn't hang here
+				fd = os.open(os.path.join(self._thin_dir, cast(bytes, header.name).decode()),
+						os.O_RDONLY | os.O_NONBLOCK)
+			except (OSError, ValueError):
+				# a missing or unusable member name only fails once it's actually read
+				continue
+			try:
+				if stat.S_ISREG(os.fstat(fd).st_mode):
+					os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+			except OSError:
+				pass
+			finally:
+				os.close(fd)
+
 	def _read(self, length: int) -> bytes:
-		data = self.file.read(length)
+		data = self._file_read(length)
 		self.position += len(data)
 		return data
 
+	def _readinto(self, buffer: memoryview) -> int:
+		""" Reads up to len(buffer) bytes into the buffer, returns the count """
+		readinto = self._file_readinto
+		if readinto is None:
+			data = self._read(len(buffer))
+			count = len(data)
+			buffer[:count] = data
+		else:
+			count = readinto(buffer) or 0
+			self.position += count
+		return count
+
+	def _readinto_full(self, buffer: memoryview) -> int:
+		"""
+		Fills the buffer, stopping early only at the end of file, returns the count
+
+		Pipes and raw streams can return less than asked for before their end.
+		"""
+		count = self._readinto(buffer)
+		while 0 < count < len(buffer):
+			more = self._readinto(buffer[count:])
+			if not more:
+				break
+			count += more
+		return count
+
+	def _read_at(self, offset: int, length: int) -> memoryview:
+		"""
+		Returns up to length bytes found at the offset of a seekable archive
+
+		The data comes from the mapping if there is one, or else from a read-ahead
+		window. The window grows while reads keep moving forward through it, so
+		runs of small members are read in large blocks, and shrinks back when
+		reads jump past it.
+		"""
+		if self._mm is not None:
+			return memoryview(self._mm)[offset:offset + length]
+
+		start = offset - self._window_offset
+		if start < 0 or start + length > self._window_len:
+			self.__fill_window(offset, length)
+			start = 0
+		return self._window_mv[start:min(start + length, self._window_len)]
+
+	def __fill_window(self, offset: int, length: int) -> None:
+		""" Refills the read-ahead window starting at the offset """
+		fill = self._window_fill
+		if self._window_offset <= offset < self._window_offset + self._window_len + fill:
+			fill = min(fill * 2, _WINDOW_MAX_LEN)
+		else:
+			fill = _WINDOW_MIN_LEN
+		fill = max(fill, length)
+		self._window_fill = fill
+
+		if len(self._window_mv) < fill:
+			self._window_mv = memoryview(bytearray(fill))
+		self._window_offset = offset
+		self._window_len = 0
+		self._seek(offset)
+		self._window_len = self._readinto(self._window_mv[:fill])
+
 	def _seek(self, offset: int) -> None:
 		if self.seekable:
-			self.file.seek(offset)
-			self.position = self.file.tell()
+			# always seek, the caller may have moved a shared file object
+			self._file_seek(offset)
+			self.position = self._file_tell()
+		elif offset == self.position:
+			# sequential reads of a stream continue where the last one stopped
+			return
 		elif offset < self.position:
 			raise ArchiveAccessError("cannot go back when reading archive from a stream")
 		else:
 			# emulate seek
+			readinto = self._file_readinto
+			if readinto is None:
+				while self.position < offset:
+					if not self._read(min(_SKIP_CHUNK_LEN, offset - self.position)):
+						# reached EOF before target offset
+						self.reached_eof = True
+						return
+				return
+
+			# discard into a scratch buffer allocated once per archive
+			if self._skip_mv is None:
+				self._skip_mv = memoryview(bytearray(_SKIP_CHUNK_LEN))
+			skip_mv = self._skip_mv
 			while self.position < offset:
-				if not self._read(min(4096, offset - self.position)):
+				count = readinto(skip_mv[:min(_SKIP_CHUNK_LEN, offset - self.position)])
+				if not count:
 					# reached EOF before target offset
 					self.reached_eof = True
 					return
+				self.position += count
 
 	def __read_file_header(self, offset: int) -> Optional[ArchiveFileHeader]:
 		""" Reads and returns a single new file header """
-		self._seek(offset)
-
-		header = self._read(HEADER_LEN)
+		if self.seekable:
+			header = self._read_at(offset, HEADER_LEN)
+		elif offset == GLOBAL_HEADER_LEN and self._prefetched_first_header is not None:
+			header = self._prefetched_first_header
+			self._prefetched_first_header = None
+		else:
+			self._seek(offset)
+			header = self._hdr_mv[:self._readinto_full(self._hdr_mv)]
 
 		if len(header) == 0:
 			self.reached_eof = True
@@ -292,37 +783,75 @@ class Archive(object):
 		if len(header) < HEADER_LEN:
 			raise ArchiveFormatError("file header too short")
 
-		file_header = ArchiveFileHeader(header, offset)
+		try:
+			file_header = ArchiveFileHeader(header, offset)
+		except ValueError as err:
+			raise ArchiveFormatError(
+					"cannot convert file header fields to integers", err)
 		if file_header.type == HEADER_GNU_TABLE:
-			self.__read_gnu_table(file_header.size)
+			self.__read_gnu_table(offset + HEADER_LEN, file_header.size)
 
 		add_len = self.__fix_name(file_header)
 		file_header.file_offset = offset + HEADER_LEN + add_len
 
 		if offset == self.next_header_offset:
-			new_offset = file_header.file_offset + file_header.size
-			self.next_header_offset = Archive.__pad2(new_offset)
+			if file_header.type in _FILE_HEADER_TYPES and self.file_data_class is ArchiveFileDataThin:
+				# thin archive members store no data after the header
+				self.next_header_offset = file_header.file_offset
+			else:
+				# members start at 2-aligned offsets
+				self.next_header_offset = (file_header.file_offset + file_header.size + 1) & ~1
 
 		return file_header
 
-	def __read_gnu_table(self, size: int) -> None:
+	def __read_gnu_table(self, offset: int, size: int) -> None:
 		""" Reads the table of filenames specific to GNU ar format """
-		table_string = self._read(size)
-		if len(table_string) != size:
-			raise ArchiveFormatError("file too short to fit the names table")
+		if self._mm is not None:
+			# parse straight from the mapping instead of copying the table out first
+			table = cast(Union[bytes, mmap.mmap], self._mm)
+			start = offset
+			if len(table) < start + size:
+				raise ArchiveFormatError("file too short to fit the names table")
+		else:
+			if self.seekable:
+				self._seek(offset)
+			table = self._read(size)
+			start = 0
+			if len(table) != size:
+				raise ArchiveFormatError("file too short to fit the names table")
+		end = start + size
 
-		self.gnu_table = {}
+		name_ends = {}
 
-		position = 0
-		if b"\x00" in table_string:
+		if table.find(b"\x00", start, end) >= 0:
 			split_char = b"\x00"
 		else:
 			split_char = b"\n"
-		for filename in table_string.split(split_char):
-			self.gnu_table[position] = filename
-			if self.gnu_table[position].endswith(b"/"):
-				self.gnu_table[position] = self.gnu_table[position][:-1] # remove trailing '/'
-			position += len(filename) + 1
+		# scan in place instead of split() to avoid building a list of every name
+		position = start
+		while position <= end:
+			name_end = table.find(split_char, position, end)
+			if name_end < 0:
+				name_end = end
+			next_position = name_end + 1
+			if name_end > position and table[name_end - 1] == 0x2f:
+				name_end -= 1 # remove trailing '/'
+			name_ends[position - start] = name_end - start
+			position = next_position
+
+		# names are only copied out of the table when a header refers to them
+		if isinstance(table, bytes):
+			self._gnu_names = table
+		else:
+			self._gnu_names = memoryview(table)[start:end]
+		self._gnu_name_ends = name_ends
+
+	@property
+	def gnu_table(self) -> Dict[int,bytes]:
+		""" The GNU names table, as names by their offset in the table """
+		names = self._gnu_names
+		return {position: bytes(names[position:name_end])
+				for position, name_end in self._gnu_name_ends.items()}
 
 	def __fix_name(self, header: ArchiveFileHeader) -> int:
 		"""
@@ -334,13 +863,18 @@ class Archive(object):
 			pass
 
 		elif header.type == HEADER_BSD:
-			filename_len = Archive.__get_bsd_filename_len(header.proxy_name)
+			# the name length follows the "#1/" prefix
+			filename_len = int(header.proxy_name[3:])
 
 			# BSD format includes the filename in the file size
 			header.size -= filename_len
 
-			self._seek(header.offset + HEADER_LEN)
-			header.name = self._read(filename_len)
+			if self.seekable and filename_len <= _WINDOW_MAX_LEN:
+				header.name = self._read_at(header.offset + HEADER_LEN, filename_len).tobytes()
+			else:
+				# the length is untrusted, don't size the read-ahead window from it
+				self._seek(header.offset + HEADER_LEN)
+				header.name = self._read(filename_len)
 			return filename_len
 
 		elif header.type == HEADER_GNU_TABLE:
@@ -348,29 +882,16 @@ class Archive(object):
 
 		elif header.type == HEADER_GNU:
 			gnu_position = int(header.proxy_name[1:])
-			if gnu_position not in self.gnu_table:
+			name_end = self._gnu_name_ends.get(gnu_position)
+			if name_end is None:
 				raise ArchiveFormatError("file references a name not present in the index")
-			header.name = self.gnu_table[gnu_position]
+			header.name = bytes(self._gnu_names[gnu_position:name_end])
 
 		elif header.type == HEADER_GNU_SYMBOLS:
 			pass
 
 		return 0
 
-	@staticmethod
-	def __pad2(num: int) -> int:
-		""" Returns a 2-aligned offset """
-		if num % 2 == 0:
-			return num
-		else:
-			return num+1
-
-	@staticmethod
-	def __get_bsd_filename_len(name: bytes) -> int:
-		""" Returns the length of the filename for a BSD style header """
-		filename_len = name[3:]
-		return int(filename_len)
-
 	def read_next_header(self) -> Optional[ArchiveFileHeader]:
 		"""
 		Reads a single new header, returning a its representation, or None at the end of file
@@ -378,8 +899,6 @@ class Archive(object):
 		header = self.__read_file_header(self.next_header_offset)
 		if header is not None:
 			self.headers.append(header)
-			if header.type in (HEADER_BSD, HEADER_NORMAL, HEADER_GNU):
-				self.archived_files[header.name] = self.file_data_class(self, header)
 
 		return header
 
@@ -388,8 +907,9 @@ class Archive(object):
 			header = self.read_next_header()
 			if header is None:
 				raise StopIteration
-			if header.type in (HEADER_BSD, HEADER_NORMAL, HEADER_GNU):
-				return self.archived_files[header.name]
+			if header.type in _FILE_HEADER_TYPES:
+				# a new header has no file object yet, skip the cache lookup
+				return self.archived_files._open_added(header)
 	next = __next__
 
 	def __iter__(self) -> "Archive":
@@ -405,7 +925,25 @@ class Archive(object):
 
 	def close(self) -> None:
 		""" Closes the archive file descriptor """
-		self.file.close()
+		if self.file_data_class is ArchiveFileDataThin:
+			for ar_file in self.archived_files._files.values():
+				ar_file.close()
+		if isinstance(self._gnu_names, memoryview):
+			# don't keep the mapping alive just for the names table
+			self._gnu_names = self._gnu_names.tobytes()
+		if self._mm is not None:
+			try:
+				self._mm.close()
+			except BufferError:
+				# views from read_memoryview() are still in use, the mapping
+				# gets released together with the last of them
+				pass
+			self._mm = None
+		try:
+			self.file.close()
+		except BufferError:
+			# the file object is an mmap or BytesIO exported by read_memoryview()
+			pass
 
 	### implement a zipfile-like interface as well
 
@@ -415,8 +953,33 @@ class Archive(object):
 
 		If there are multiple files of the same name, there may be duplicates in the list.
 		"""
-		self.read_all_headers()
-		return [header.name for header in self.headers if header.type in (HEADER_BSD, HEADER_NORMAL, HEADER_GNU)]
+		return list(self.iter_names())
+
+	def iter_names(self) -> Iterator[bytes]:
+		"""
+		Yield the names of files stored in the archive, reading headers only as needed
+
+		Unlike namelist(), headers past the point where the caller stops iterating
+		are not read at all.
+		"""
+		for header in self.iter_headers():
+			if header.type in _FILE_HEADER_TYPES:
+				yield cast(bytes, header.name)
+
+	def iter_headers(self) -> Iterator[ArchiveFileHeader]:
+		"""
+		Yield all headers of the archive, including the special ones, reading them only as needed
+
+		Headers read earlier come first, then new ones are read one at a time,
+		so stopping the iteration early leaves the rest of the archive unread.
+		"""
+		index = 0
+		while True:
+			if index == len(self.headers):
+				if self.reached_eof or self.read_next_header() is None:
+					return
+			yield self.headers[index]
+			index += 1
 
 	def infolist(self) -> List[ArchiveFileHeader]:
 		"""
@@ -425,7 +988,7 @@ class Archive(object):
 		These can be used with .open() to get the contents.
 		"""
 		self.read_all_headers()
-		return [header for header in self.headers if header.type in (HEADER_BSD, HEADER_NORMAL, HEADER_GNU)]
+		return [header for header in self.headers if header.type in _FILE_HEADER_TYPES]
 
 	def open(self, name: Union[bytes,ArchiveFileHeader]) -> ArchiveFileData:
 		"""
@@ -450,6 +1013,43 @@ class Archive(object):
 
 		raise ValueError("Can't look up file using type %s, expected bytes or ArchiveFileHeader" % (type(name),))
 
+	def read_members(self, names: Iterable[bytes], workers: int = 1) -> Dict[bytes, bytes]:
+		"""
+		Return the full contents of the named files, as a dict keyed by name
+
+		The files are read from their start, without affecting the objects
+		returned by .open() or found in archived_files. With more than one worker,
+		members of thin archives are read from their external files in parallel
+		threads. Regular archives share one file position, so they are always
+		read in turn. For thin archives, the OS is first asked to start reading
+		the external files of the named members.
+		"""
+		self.read_all_headers()
+
+		index = self.archived_files._index()
+		headers = cast(Dict[bytes, ArchiveFileHeader], {})
+		for name in names:
+			header = index.get(name)
+			if header is None:
+				raise KeyError("There is no item named %r in the archive" % (name,))
+			headers[name] = header
+
+		if self.file_data_class is ArchiveFileDataThin:
+			self._advise_thin_members(list(headers.values()))
+		if workers > 1 and len(headers) > 1 and self.file_data_class is ArchiveFileDataThin:
+			# the import is slow, only pay for it when there's parallel work
+			from concurrent.futures import ThreadPoolExecutor
+			with ThreadPoolExecutor(min(workers, len(headers))) as executor:
+				data = list(executor.map(self.__read_member, headers.values()))
+		else:
+			data = [self.__read_member(header) for header in headers.values()]
+		return dict(zip(headers, data))
+
+	def __read_member(self, header: ArchiveFileHeader) -> bytes:
+		""" Reads a whole file through its own file object """
+		with self.file_data_class(self, header) as ar_file:
+			return ar_file.read()
+
 	def __enter__(self) -> "Archive":
 		return self
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from setuptools import setup
+from setuptools import setup, Extension
 
 setup(name='arpy',
 		version='2.3.0',
@@ -10,6 +10,8 @@ setup(name='arpy',
 		author_email='viraptor@gmail.com',
 		url='https://github.com/viraptor/arpy',
 		py_modules=['arpy'],
+		# optional accelerator, arpy falls back to pure python if it fails to build
+		ext_modules=[Extension('_arpy_native', sources=['_arpy_native.c'], optional=True)],
 		license="Simplified BSD",
 		test_suite='test',
 		long_description="""'arpy' is a library for accessing the archive files and reading the contents. It supports extended long filenames in both GNU and BSD format. Right now it does not support the symbol tables, but can ignore them gracefully.
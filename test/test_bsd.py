@@ -1,33 +1,67 @@
 import arpy
+import io
 import unittest
 import os
 
+TEST_DIR = os.path.dirname(__file__)
+BSD_SINGLE_NAME_AR = os.path.join(TEST_DIR, 'bsd_single_name.ar')
+BSD_MULTI_NAMES_AR = os.path.join(TEST_DIR, 'bsd_multi_names.ar')
+BSD_MIXED_AR = os.path.join(TEST_DIR, 'bsd_mixed.ar')
+
 class BSDExtendedNames(unittest.TestCase):
 	def test_single_name(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'bsd_single_name.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length'],
-				list(ar.archived_files.keys()))
-		self.assertEqual(2, len(ar.headers))
-		ar.close()
+		with arpy.Archive(BSD_SINGLE_NAME_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual({b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length'},
+					ar.archived_files.keys())
+			self.assertEqual(2, len(ar.headers))
 	
 	def test_multi_name_with_space(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'bsd_multi_names.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
-			b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
-			sorted(ar.archived_files.keys()))
-		self.assertEqual(3, len(ar.headers))
-		ar.close()
+		with arpy.Archive(BSD_MULTI_NAMES_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
+				sorted(ar.archived_files.keys()))
+			self.assertEqual(3, len(ar.headers))
 	
 	def test_mixed_names(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'bsd_mixed.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
-			b'short'],
-			sorted(ar.archived_files.keys()))
-		self.assertEqual(3, len(ar.headers))
-		ar.close()
+		with arpy.Archive(BSD_MIXED_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'short'],
+				sorted(ar.archived_files.keys()))
+			self.assertEqual(3, len(ar.headers))
+
+	def test_mixed_names_fileobj(self):
+		with open(BSD_MIXED_AR, 'rb') as f:
+			data = f.read()
+		with arpy.Archive(fileobj=io.BytesIO(data)) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'short'],
+				sorted(ar.archived_files.keys()))
+
+	def test_mixed_names_stream(self):
+		class NonSeekableIO(io.BytesIO):
+			def seekable(self):
+				return False
+
+		with open(BSD_MIXED_AR, 'rb') as f:
+			data = f.read()
+		with arpy.Archive(fileobj=NonSeekableIO(data)) as ar:
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'short'],
+				ar.namelist())
+
+	def test_oversized_name_length(self):
+		data = b"!<arch>\n" \
+			b"#1/2000000000   1364071329  1000  100   100644  2000000010`\n" \
+			b"short_name" + b"x" * 20
+		with arpy.Archive(fileobj=io.BytesIO(data)) as ar:
+			ar.read_all_headers()
+			# the name is cut short by the end of file, without a 2 GB buffer
+			self.assertEqual([b"short_name" + b"x" * 20], ar.namelist())
+			self.assertLessEqual(len(ar._window_mv), arpy._WINDOW_MAX_LEN)
 
 if __name__ == "__main__":
 	unittest.main()
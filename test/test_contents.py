@@ -1,26 +1,92 @@
 import arpy
+import gzip
 import unittest
 import os
 import io
+import tempfile
+
+TEST_DIR = os.path.dirname(__file__)
+CONTENTS_AR = os.path.join(TEST_DIR, 'contents.ar')
 
 class ArContents(unittest.TestCase):
 	def test_archive_contents(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'contents.ar'))
-		ar.read_all_headers()
-		f1_contents = ar.archived_files[b'file1'].read()
-		f2_contents = ar.archived_files[b'file2'].read()
-		self.assertEqual(b'test_in_file_1\n', f1_contents)
-		self.assertEqual(b'test_in_file_2\n', f2_contents)
-		ar.close()
+		with arpy.Archive(CONTENTS_AR) as ar:
+			ar.read_all_headers()
+			f1_contents = ar.archived_files[b'file1'].read()
+			f2_contents = ar.archived_files[b'file2'].read()
+			self.assertEqual(b'test_in_file_1\n', f1_contents)
+			self.assertEqual(b'test_in_file_2\n', f2_contents)
+
+	def test_gzip_fileobj(self):
+		with open(CONTENTS_AR, 'rb') as f:
+			data = f.read()
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			path = os.path.join(tmp_dir, 'contents.ar.gz')
+			with gzip.open(path, 'wb') as f:
+				f.write(data)
+			# fileno() of a GzipFile belongs to the compressed file
+			with arpy.Archive(fileobj=gzip.open(path, 'rb')) as ar:
+				self.assertEqual(b'test_in_file_1\n', ar.open(b'file1').read())
+				self.assertEqual(b'test_in_file_2\n', ar.open(b'file2').read())
+
+	def test_archived_files_reused(self):
+		with arpy.Archive(CONTENTS_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual(2, len(ar.archived_files))
+			self.assertIn(b'file1', ar.archived_files)
+			f1 = ar.archived_files[b'file1']
+			f1.read(4)
+			self.assertIs(f1, ar.archived_files[b'file1'])
+			self.assertIs(f1, ar.open(b'file1'))
+			self.assertEqual(4, ar.open(b'file1').tell())
+
+	def test_read_after_fileobj_moved(self):
+		with open(CONTENTS_AR, 'rb') as f:
+			fileobj = io.BytesIO(f.read())
+		with arpy.Archive(fileobj=fileobj) as ar:
+			f1 = ar.open(b'file1')
+			self.assertEqual(b'test', f1.read(4))
+			fileobj.seek(0)
+			self.assertEqual(b'_in_', f1.read(4))
+
+	def test_archived_files_duplicate_name(self):
+		data = b"!<arch>\n" \
+			b"file1/          1364071329  1000  100   100644  2         `\nf1" \
+			b"file1/          1364071329  1000  100   100644  2         `\nf2"
+		with arpy.Archive(fileobj=io.BytesIO(data)) as ar:
+			ar.read_all_headers()
+			self.assertEqual({b'file1'}, ar.archived_files.keys())
+			self.assertEqual(b'f2', ar.archived_files[b'file1'].read())
+			self.assertEqual([b'file1', b'file1'], ar.namelist())
+
+	def test_archived_files_after_iteration(self):
+		data = b"!<arch>\n" \
+			b"file1/          1364071329  1000  100   100644  2         `\nf1" \
+			b"file1/          1364071329  1000  100   100644  2         `\nf2"
+		with arpy.Archive(fileobj=io.BytesIO(data)) as ar:
+			first = next(ar)
+			self.assertIs(first, ar.archived_files[b'file1'])
+			second = next(ar)
+			self.assertIs(second, ar.archived_files[b'file1'])
+			self.assertEqual(b'f2', second.read())
 
 
 class ArZipLike(unittest.TestCase):
 	def setUp(self):
-		self.ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'contents.ar'))
+		self.ar = arpy.Archive(CONTENTS_AR)
+
+	def tearDown(self):
+		self.ar.close()
 
 	def test_listnames(self):
 		self.assertEqual([b'file1', b'file2'], self.ar.namelist())
-		self.ar.close()
+
+	def test_iter_names(self):
+		names = self.ar.iter_names()
+		self.assertEqual(b'file1', next(names))
+		self.assertEqual(1, len(self.ar.headers))
+		self.assertEqual([b'file2'], list(names))
+		self.assertEqual([b'file1', b'file2'], list(self.ar.iter_names()))
 
 	def test_listheaders(self):
 		headers = self.ar.infolist()
@@ -40,6 +106,16 @@ class ArZipLike(unittest.TestCase):
 		f = self.ar.open(header)
 		self.assertEqual(b'file1', f.header.name)
 
+	def test_read_members(self):
+		f1 = self.ar.open(b'file1')
+		f1.read(4)
+		self.assertEqual({b'file1': b'test_in_file_1\n', b'file2': b'test_in_file_2\n'},
+				self.ar.read_members([b'file1', b'file2']))
+		self.assertEqual(4, f1.tell())
+
+	def test_read_members_fail(self):
+		self.assertRaises(KeyError, self.ar.read_members, [b'file1', b'xxxx'])
+
 	def test_openheader_fail(self):
 		content = b"file1/          1364071329  1000  100   100644  5000      `\n"
 		self.assertRaises(KeyError, self.ar.open, arpy.ArchiveFileHeader(content, 0))
@@ -47,21 +123,27 @@ class ArZipLike(unittest.TestCase):
 
 class ArContext(unittest.TestCase):
 	def test_context(self):
-		with arpy.Archive(os.path.join(os.path.dirname(__file__), 'contents.ar')) as ar:
+		with arpy.Archive(CONTENTS_AR) as ar:
 			self.assertIsInstance(ar, arpy.Archive)
 			with ar.open(b'file1') as f:
 				self.assertIsInstance(f, arpy.ArchiveFileData)
 
 
 class ArContentsSeeking(unittest.TestCase):
-	def setUp(self):
-		self.ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'contents.ar'))
-		self.ar.read_all_headers()
+	@classmethod
+	def setUpClass(cls):
+		# the tests only move around in file1, so one parsed archive serves all
+		cls.shared_ar = arpy.Archive(CONTENTS_AR)
+		cls.shared_ar.read_all_headers()
 
-		self.f1 = self.ar.archived_files[b'file1']
+	@classmethod
+	def tearDownClass(cls):
+		cls.shared_ar.close()
 
-	def tearDown(self):
-		self.ar.close()
+	def setUp(self):
+		self.ar = self.shared_ar
+		self.f1 = self.ar.archived_files[b'file1']
+		self.f1.seek(0)
 
 	def test_content_opens_at_zero(self):
 		self.assertEqual(0, self.f1.tell())
@@ -92,6 +174,31 @@ class ArContentsSeeking(unittest.TestCase):
 		contents_after = self.f1.read()
 		self.assertEqual(contents_before[-4:], contents_after)
 
+	def test_read_negative_size(self):
+		self.f1.seek(5)
+		self.assertEqual(b'in_file_1\n', self.f1.read(-1))
+		self.assertEqual(15, self.f1.tell())
+
+	def test_read_keeps_archive_position(self):
+		position = self.ar.file.tell()
+		self.assertEqual(b'test_in_file_1\n', self.f1.read())
+		self.assertEqual(position, self.ar.file.tell())
+
+	def test_readinto_keeps_archive_position(self):
+		position = self.ar.file.tell()
+		buffer = bytearray(20)
+		self.assertEqual(15, self.f1.readinto(buffer))
+		self.assertEqual(b'test_in_file_1\n', buffer[:15])
+		self.assertEqual(position, self.ar.file.tell())
+
+	def test_readinto(self):
+		buffer = bytearray(10)
+		self.assertEqual(10, self.f1.readinto(buffer))
+		self.assertEqual(b'test_in_fi', buffer)
+		self.assertEqual(5, self.f1.readinto(buffer))
+		self.assertEqual(b'le_1\n', buffer[:5])
+		self.assertEqual(0, self.f1.readinto(buffer))
+
 	def test_seek_failure(self):
 		self.assertRaises(arpy.ArchiveAccessError, self.f1.seek, 10, 10)
 
@@ -102,6 +209,67 @@ class ArContentsSeeking(unittest.TestCase):
 		self.assertTrue(self.f1.seekable())
 
 
+class ArContentsMmap(unittest.TestCase):
+	def setUp(self):
+		self.ar = arpy.Archive(CONTENTS_AR, use_mmap=True)
+		self.ar.read_all_headers()
+
+		self.f1 = self.ar.archived_files[b'file1']
+
+	def tearDown(self):
+		self.ar.close()
+
+	def test_read(self):
+		self.assertEqual(b'test_in_file_1\n', self.f1.read())
+		self.assertEqual(b'test_in_file_2\n', self.ar.archived_files[b'file2'].read())
+
+	def test_readinto(self):
+		buffer = bytearray(20)
+		self.assertEqual(15, self.f1.readinto(buffer))
+		self.assertEqual(b'test_in_file_1\n', buffer[:15])
+
+	def test_read_memoryview(self):
+		view = self.f1.read_memoryview(4)
+		self.assertIsInstance(view, memoryview)
+		self.assertEqual(b'test', view)
+		self.assertEqual(b'_in_file_1\n', self.f1.read_memoryview())
+		self.assertEqual(b'', self.f1.read_memoryview())
+		view.release()
+
+	def test_close_with_view_alive(self):
+		view = self.f1.read_memoryview()
+		self.ar.close()
+		self.assertEqual(b'test_in_file_1\n', view)
+
+	def test_gzip_fileobj(self):
+		with open(CONTENTS_AR, 'rb') as f:
+			data = f.read()
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			path = os.path.join(tmp_dir, 'contents.ar.gz')
+			with gzip.open(path, 'wb') as f:
+				f.write(data)
+			# mapping the compressed file would show gzip data instead
+			with arpy.Archive(fileobj=gzip.open(path, 'rb'), use_mmap=True) as ar:
+				self.assertEqual([b'file1', b'file2'], ar.namelist())
+				self.assertEqual(b'test_in_file_1\n', ar.open(b'file1').read_memoryview())
+
+	def test_read_memoryview_without_mmap(self):
+		with arpy.Archive(CONTENTS_AR) as ar:
+			f1 = ar.open(b'file1')
+			self.assertEqual(b'test_in_file_1\n', f1.read_memoryview())
+
+	def test_read_memoryview_bytesio(self):
+		with open(CONTENTS_AR, 'rb') as f:
+			data = io.BytesIO(f.read())
+		with arpy.Archive(fileobj=data) as ar:
+			view = ar.open(b'file1').read_memoryview()
+			self.assertEqual(b'test_in_file_1\n', view)
+			# the view shares the BytesIO buffer instead of copying it
+			self.assertRaises(BufferError, data.truncate, 0)
+		self.assertEqual(b'test_in_file_1\n', view)
+		view.release()
+
+
 class NonSeekableIO(io.BytesIO):
 	def seek(self, *args):
 		raise io.UnsupportedOperation("underlying stream is not seekable")
@@ -113,6 +281,29 @@ class NonSeekableIO(io.BytesIO):
 		io.BytesIO.seek(self, *args)
 
 
+class BufferedReadaheadIO(io.RawIOBase):
+	""" Non-seekable stream reading its source in large blocks """
+	block_size = 65536
+
+	def __init__(self, source):
+		self._source = source
+		self._buffer = bytearray()
+
+	def readable(self):
+		return True
+
+	def seekable(self):
+		return False
+
+	def readinto(self, buffer):
+		if len(self._buffer) < len(buffer):
+			self._buffer += self._source.read(max(len(buffer), self.block_size))
+		count = min(len(buffer), len(self._buffer))
+		buffer[:count] = self._buffer[:count]
+		del self._buffer[:count]
+		return count
+
+
 class ArContentsNoSeeking(unittest.TestCase):
 	def setUp(self):
 		big_archive = NonSeekableIO()
@@ -122,44 +313,88 @@ class ArContentsNoSeeking(unittest.TestCase):
 		big_archive.write(b"file2/          1364071329  1000  100   100644  2         `\n")
 		big_archive.write(b"xx")
 		big_archive.force_seek(0)
-		self.big_archive = big_archive
+		self.raw_archive = big_archive
+		self.big_archive = BufferedReadaheadIO(big_archive)
 
 	def test_stream_read(self):
 		# make sure all contents can be read without seeking
-		ar = arpy.Archive(fileobj=self.big_archive)
-		f = ar.next()
-		contents = f.read()
-		self.assertEqual(b'file1', f.header.name)
-		self.assertEqual(b' '*5000, contents)
-		f = ar.next()
-		contents = f.read()
-		self.assertEqual(b'file2', f.header.name)
-		self.assertEqual(b'xx', contents)
-		ar.close()
+		with arpy.Archive(fileobj=self.big_archive) as ar:
+			f = ar.next()
+			contents = f.read()
+			self.assertEqual(b'file1', f.header.name)
+			self.assertEqual(b' '*5000, contents)
+			f = ar.next()
+			contents = f.read()
+			self.assertEqual(b'file2', f.header.name)
+			self.assertEqual(b'xx', contents)
 
 	def test_stream_skip_file(self):
 		# make sure skipping contents is possible without seeking
-		ar = arpy.Archive(fileobj=self.big_archive)
+		with arpy.Archive(fileobj=self.big_archive) as ar:
+			f = ar.next()
+			self.assertEqual(b'file1', f.header.name)
+			f = ar.next()
+			contents = f.read()
+			self.assertEqual(b'file2', f.header.name)
+			self.assertEqual(b'xx', contents)
+
+	def test_stream_skip_file_without_readinto(self):
+		class ReadOnlyStream(object):
+			def __init__(self, stream):
+				self.read = stream.read
+
+			def seekable(self):
+				return False
+
+		# the stream has no close(), so the archive is not closed either
+		ar = arpy.Archive(fileobj=ReadOnlyStream(self.big_archive))
 		f = ar.next()
 		self.assertEqual(b'file1', f.header.name)
 		f = ar.next()
-		contents = f.read()
 		self.assertEqual(b'file2', f.header.name)
-		self.assertEqual(b'xx', contents)
-		ar.close()
+		self.assertEqual(b'xx', f.read())
+
+	def test_stream_first_header_prefetched(self):
+		with arpy.Archive(fileobj=self.raw_archive) as ar:
+			# the global header and the first file header come in one read
+			self.assertEqual(8 + 60, self.raw_archive.tell())
+			f = ar.next()
+			self.assertEqual(b'file1', f.header.name)
+			self.assertEqual(8 + 60, self.raw_archive.tell())
+
+	def test_stream_short_reads(self):
+		class TrickleIO(io.RawIOBase):
+			# returns at most 7 bytes per read, like a slow pipe
+			def __init__(self, source):
+				self._source = source
+
+			def readable(self):
+				return True
+
+			def readinto(self, buffer):
+				data = self._source.read(min(len(buffer), 7))
+				buffer[:len(data)] = data
+				return len(data)
+
+		with arpy.Archive(fileobj=TrickleIO(self.raw_archive)) as ar:
+			self.assertEqual([b'file1', b'file2'], [f.header.name for f in ar])
+
+		self.raw_archive.force_seek(0)
+		with arpy.Archive(fileobj=TrickleIO(self.raw_archive)) as ar:
+			buffer = bytearray(5000)
+			self.assertEqual(5000, ar.next().readinto(buffer))
+			self.assertEqual(b' '*5000, buffer)
 
 	def test_seek_fail(self):
-		ar = arpy.Archive(fileobj=self.big_archive)
-		f1 = ar.next()
-		ar.next()
-		self.assertRaises(arpy.ArchiveAccessError, f1.read)
-		ar.close()
+		with arpy.Archive(fileobj=self.big_archive) as ar:
+			f1 = ar.next()
+			ar.next()
+			self.assertRaises(arpy.ArchiveAccessError, f1.read)
 
 	def test_check_seekable(self):
-		ar = arpy.Archive(fileobj=self.big_archive)
-		f1 = ar.next()
-		self.assertFalse(f1.seekable())
-		ar.close()
+		with arpy.Archive(fileobj=self.big_archive) as ar:
+			f1 = ar.next()
+			self.assertFalse(f1.seekable())
 
 if __name__ == "__main__":
 	unittest.main()
@@ -12,36 +12,48 @@ class SimpleNames(unittest.TestCase):
 
 	def test_bad_file_header_magic(self):
 		bad_ar = b'!<arch>\nfile1/          1364071329  1000  100   100644  15        qq'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
 
 	def test_bad_file_header_short(self):
 		bad_ar = b'!<arch>\nfile1/          1364071329  1000'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
 
 	def test_bad_file_header_nums(self):
 		bad_ar = b'!<arch>\nfile1/          aaaa071329  1000  100   100644  15        `\n'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+
+	def test_bad_file_header_size_field(self):
+		bad_ar = b'!<arch>\nfile1/          1364071329  1000  100   100644  1x        `\n'
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+
+	def test_bad_file_header_mode(self):
+		bad_ar = b'!<arch>\nfile1/          1364071329  1000  100   100944  0         `\n'
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			with self.assertRaises(arpy.ArchiveFormatError):
+				# reported when reading the header if the C parser is built
+				ar.read_next_header().mode
 
 	def test_bad_file_size(self):
 		bad_ar = b'!<arch>\nfile1/          1364071329  1000  100   100644  15        `\nabc'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		ar.read_all_headers()
-		f1 = ar.archived_files[b'file1']
-		self.assertRaises(arpy.ArchiveAccessError, f1.read)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			ar.read_all_headers()
+			f1 = ar.archived_files[b'file1']
+			self.assertRaises(arpy.ArchiveAccessError, f1.read)
 
 	def test_bad_table_size(self):
 		bad_ar = b'!<arch>\n//                                              10        `\n'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
 
 	def test_bad_table_reference(self):
 		bad_ar = b'!<arch>\n//                                               0        `\n' \
 			b'/9              1297730011  1000  1000  100644  0         `\n'
-		ar = arpy.Archive(fileobj=io.BytesIO(bad_ar))
-		self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
+		with arpy.Archive(fileobj=io.BytesIO(bad_ar)) as ar:
+			self.assertRaises(arpy.ArchiveFormatError, ar.read_all_headers)
 
 if __name__ == "__main__":
 	unittest.main()
@@ -2,41 +2,62 @@ import arpy
 import unittest
 import os
 
+TEST_DIR = os.path.dirname(__file__)
+GNU_SINGLE_NAME_AR = os.path.join(TEST_DIR, 'gnu_single_name.ar')
+GNU_MULTI_NAMES_AR = os.path.join(TEST_DIR, 'gnu_multi_names.ar')
+MSVC_LIB_AR = os.path.join(TEST_DIR, 'msvc_lib.ar')
+GNU_MIXED_AR = os.path.join(TEST_DIR, 'gnu_mixed.ar')
+
 class GNUExtendedNames(unittest.TestCase):
 	def test_single_name(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'gnu_single_name.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length'],
-				list(ar.archived_files.keys()))
-		self.assertEqual(2, len(ar.headers))
-		ar.close()
+		with arpy.Archive(GNU_SINGLE_NAME_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual({b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length'},
+					ar.archived_files.keys())
+			self.assertEqual(2, len(ar.headers))
 	
 	def test_multi_name_with_space(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'gnu_multi_names.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
-			b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
-			sorted(ar.archived_files.keys()))
-		self.assertEqual(3, len(ar.headers))
-		ar.close()
+		with arpy.Archive(GNU_MULTI_NAMES_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
+				sorted(ar.archived_files.keys()))
+			self.assertEqual(3, len(ar.headers))
 	
+	def test_gnu_table(self):
+		expected = {
+			0: b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+			86: b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space ',
+			184: b''}
+		for use_mmap in (False, True):
+			with arpy.Archive(GNU_MULTI_NAMES_AR, use_mmap=use_mmap) as ar:
+				ar.read_all_headers()
+				self.assertEqual(expected, ar.gnu_table)
+			# the table outlives the mapping
+			self.assertEqual(expected, ar.gnu_table)
+
 	def test_multi_name_with_null_separator(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'msvc_lib.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
-			b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
-			sorted(ar.archived_files.keys()))
-		self.assertEqual(3, len(ar.headers))
-		ar.close()
+		with arpy.Archive(MSVC_LIB_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length_with_space '],
+				sorted(ar.archived_files.keys()))
+			self.assertEqual(3, len(ar.headers))
 
 	def test_mixed_names(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'gnu_mixed.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
-			b'short'],
-			sorted(ar.archived_files.keys()))
-		self.assertEqual(3, len(ar.headers))
-		ar.close()
+		with arpy.Archive(GNU_MIXED_AR) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'short'],
+				sorted(ar.archived_files.keys()))
+			self.assertEqual(3, len(ar.headers))
+
+	def test_mixed_names_mmap(self):
+		with arpy.Archive(GNU_MIXED_AR, use_mmap=True) as ar:
+			ar.read_all_headers()
+			self.assertEqual([b'a_very_long_name_for_the_gnu_type_header_so_it_can_overflow_the_standard_name_length',
+				b'short'],
+				sorted(ar.archived_files.keys()))
 
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,86 @@
+import arpy
+import glob
+import os
+import unittest
+
+try:
+	import _arpy_native
+except ImportError:
+	_arpy_native = None
+
+
+def raw_headers():
+	paths = glob.glob(os.path.join(os.path.dirname(__file__), '*.ar'))
+	for path in sorted(paths):
+		with arpy.Archive(path) as ar:
+			ar.read_all_headers()
+			for header in ar.headers:
+				ar.file.seek(header.offset)
+				yield path, ar.file.read(arpy.HEADER_LEN), header.offset
+
+
+def header_fields(header):
+	fields = [header.type, header.size, header.offset, header.name, header.file_offset]
+	if header.type in (arpy.HEADER_BSD, arpy.HEADER_GNU, arpy.HEADER_NORMAL):
+		fields += [header.timestamp, header.uid, header.gid, header.mode]
+	else:
+		fields.append(header.proxy_name)
+	return fields
+
+
+@unittest.skipIf(_arpy_native is None, "_arpy_native is not built")
+class NativeParser(unittest.TestCase):
+	def setUp(self):
+		self.native_parse_header = arpy._native_parse_header
+
+	def tearDown(self):
+		arpy._native_parse_header = self.native_parse_header
+
+	def test_matches_python_parser(self):
+		for path, raw, offset in raw_headers():
+			arpy._native_parse_header = _arpy_native.parse_header
+			native = header_fields(arpy.ArchiveFileHeader(raw, offset))
+			arpy._native_parse_header = None
+			python = header_fields(arpy.ArchiveFileHeader(raw, offset))
+			self.assertEqual(python, native, path)
+
+	def test_matches_python_parser_on_unusual_numbers(self):
+		fields = [
+			(b'1364071329', b'1000\t ', b'100', b'100644', b'5000'),
+			(b'1364071329', b'1000', b'100', b'100644', b'-2'),
+			(b'1364071329', b'1000', b'100', b'100644', b'+2'),
+			(b'-1', b'', b'', b'\t100644', b'2'),
+			(b'1_000', b'1000', b'100', b'100644', b'2'),
+		]
+		for timestamp, uid, gid, mode, size in fields:
+			raw = b'%-16s%-12s%-6s%-6s%-8s%-10s`\n' % (
+					b'file1/', timestamp, uid, gid, mode, size)
+			arpy._native_parse_header = _arpy_native.parse_header
+			native = header_fields(arpy.ArchiveFileHeader(raw, 8))
+			arpy._native_parse_header = None
+			python = header_fields(arpy.ArchiveFileHeader(raw, 8))
+			self.assertEqual(python, native, raw)
+
+	def test_rejects_what_python_rejects(self):
+		for uid in (b'1 0', b'-', b'0x10'):
+			raw = b'%-16s%-12s%-6s%-6s%-8s%-10s`\n' % (
+					b'file1/', b'1364071329', uid, b'100', b'100644', b'2')
+			arpy._native_parse_header = None
+			# plain digits and spaces are only converted on access
+			self.assertRaises(arpy.ArchiveFormatError,
+					lambda: arpy.ArchiveFileHeader(raw, 8).uid)
+			self.assertRaises(ValueError, _arpy_native.parse_header, raw, 8)
+
+	def test_bad_magic(self):
+		content = b"file1/          1364071329  1000  100   100644  5000      qq"
+		self.assertIsNone(_arpy_native.parse_header(content, 0))
+
+	def test_bad_number(self):
+		content = b"file1/          aaaa071329  1000  100   100644  5000      `\n"
+		self.assertRaises(ValueError, _arpy_native.parse_header, content, 0)
+
+	def test_bad_length(self):
+		self.assertRaises(ValueError, _arpy_native.parse_header, b"file1/", 0)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -1,68 +1,154 @@
 import arpy
 import io
+import mmap
 import unittest
 import os
+import tempfile
+
+TEST_DIR = os.path.dirname(__file__)
+NORMAL_AR = os.path.join(TEST_DIR, 'normal.ar')
+EMPTY_AR = os.path.join(TEST_DIR, 'empty.ar')
+SYM_AR = os.path.join(TEST_DIR, 'sym.ar')
+WINDOWS_AR = os.path.join(TEST_DIR, 'windows.ar')
 
 class SimpleNames(unittest.TestCase):
 	def test_single_name(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'normal.ar'))
-		ar.read_all_headers()
-		self.assertEqual([b'short'],
-				list(ar.archived_files.keys()))
-		self.assertEqual(1, len(ar.headers))
-		ar.close()
+		with arpy.Archive(NORMAL_AR) as ar:
+			self.assertEqual([b'short'],
+					[header.name for header in ar.iter_headers()])
+			self.assertEqual(1, len(ar.headers))
 
 	def test_header_description(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'normal.ar'))
-		header = ar.read_next_header()
-		self.assertTrue(repr(header).startswith('<ArchiveFileHeader'))
-		ar.close()
+		with arpy.Archive(NORMAL_AR) as ar:
+			header = ar.read_next_header()
+			self.assertTrue(repr(header).startswith('<ArchiveFileHeader'))
+
+	def test_header_attributes(self):
+		with arpy.Archive(NORMAL_AR) as ar:
+			header = ar.read_next_header()
+			self.assertEqual(1297731967, header.timestamp)
+			self.assertEqual(1000, header.uid)
+			self.assertEqual(1000, header.gid)
+			self.assertEqual(0o100644, header.mode)
+
+	def test_header_signed_and_tab_padded(self):
+		raw = b'%-16s%-12s%-6s%-6s%-8s%-10s`\n' % (
+				b'short/', b'-1', b'\t1000', b' ', b'100644\t', b'+5')
+		header = arpy.ArchiveFileHeader(raw, 8)
+		self.assertEqual(-1, header.timestamp)
+		self.assertEqual(1000, header.uid)
+		self.assertIsNone(header.gid)
+		self.assertEqual(0o100644, header.mode)
+		self.assertEqual(5, header.size)
 
 	def test_empty_ar(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'empty.ar'))
-		ar.read_all_headers()
-		self.assertEqual([],
-				list(ar.archived_files.keys()))
-		self.assertEqual(0, len(ar.headers))
-		ar.close()
+		with arpy.Archive(EMPTY_AR) as ar:
+			self.assertEqual([], list(ar.iter_headers()))
+			self.assertEqual(0, len(ar.headers))
+
+	def test_iter_headers_special(self):
+		with arpy.Archive(SYM_AR) as ar:
+			headers = ar.iter_headers()
+			self.assertEqual(arpy.HEADER_GNU_SYMBOLS, next(headers).type)
+			self.assertEqual(1, len(ar.headers))
+			self.assertEqual(b"a.o", next(headers).name)
+			self.assertEqual(ar.headers, list(ar.iter_headers()))
 
 	def test_symbols(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'sym.ar'))
-		syms = ar.read_next_header()
-		self.assertEqual(arpy.HEADER_GNU_SYMBOLS, syms.type)
-		self.assertEqual(4, syms.size)
-		ao = ar.read_next_header()
-		self.assertEqual(arpy.HEADER_NORMAL, ao.type)
-		self.assertEqual(0, ao.size)
-		self.assertEqual(b"a.o", ao.name)
-		ar.close()
+		with arpy.Archive(SYM_AR) as ar:
+			syms = ar.read_next_header()
+			self.assertEqual(arpy.HEADER_GNU_SYMBOLS, syms.type)
+			self.assertEqual(4, syms.size)
+			ao = ar.read_next_header()
+			self.assertEqual(arpy.HEADER_NORMAL, ao.type)
+			self.assertEqual(0, ao.size)
+			self.assertEqual(b"a.o", ao.name)
 
 	def test_windows(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'windows.ar'))
-		file_header = ar.read_next_header()
-		self.assertIsNone(file_header.gid)
-		self.assertIsNone(file_header.uid)
-		ar.close()
+		with arpy.Archive(WINDOWS_AR) as ar:
+			file_header = ar.read_next_header()
+			self.assertIsNone(file_header.gid)
+			self.assertIsNone(file_header.uid)
 
 	def test_fileobj(self):
-		with open(os.path.join(os.path.dirname(__file__), 'normal.ar'), "rb") as f:
+		with open(NORMAL_AR, "rb") as f:
+			mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		with arpy.Archive(fileobj=mm) as ar:
+			ar.read_all_headers()
+			self.assertEqual({b'short'},
+					ar.archived_files.keys())
+			self.assertEqual(1, len(ar.headers))
+		self.assertTrue(mm.closed)
+
+	def test_fileobj_without_readinto(self):
+		class ReadOnlyIO(object):
+			def __init__(self, data):
+				self._data = io.BytesIO(data)
+				self.read = self._data.read
+				self.seek = self._data.seek
+				self.tell = self._data.tell
+
+		with open(NORMAL_AR, "rb") as f:
 			data = f.read()
-		ar = arpy.Archive(fileobj=io.BytesIO(data))
+		# the file object has no close(), so the archive is not closed either
+		ar = arpy.Archive(fileobj=ReadOnlyIO(data))
 		ar.read_all_headers()
-		self.assertEqual([b'short'],
-				list(ar.archived_files.keys()))
-		self.assertEqual(1, len(ar.headers))
-		ar.close()
+		self.assertEqual({b'short'},
+				ar.archived_files.keys())
+		self.assertEqual(b'short', ar.headers[0].name)
+
+
+class ManyMembers(unittest.TestCase):
+	# enough members, of mixed (and odd) sizes, to go through a number of
+	# read-ahead windows, with some members larger than a whole window
+	sizes = [(i * 7) % 41 if i % 500 else 300000 + i for i in range(3000)]
+
+	@classmethod
+	def setUpClass(cls):
+		data = io.BytesIO()
+		data.write(b"!<arch>\n")
+		for i, size in enumerate(cls.sizes):
+			data.write(("m%-14d 1364071329  1000  100   100644  %-10d`\n" % (i, size)).encode())
+			data.write(b"%c" % (i % 256) * size)
+			if size % 2:
+				data.write(b"\n")
+		cls.data = data.getvalue()
+		with tempfile.NamedTemporaryFile(suffix='.ar', delete=False) as f:
+			f.write(cls.data)
+			cls.path = f.name
+
+	@classmethod
+	def tearDownClass(cls):
+		os.unlink(cls.path)
+
+	def check_archive(self, ar):
+		headers = ar.infolist()
+		self.assertEqual([("m%d" % i).encode() for i in range(len(self.sizes))],
+				[header.name for header in headers])
+		self.assertEqual(self.sizes, [header.size for header in headers])
+		for i in (0, 1, 499, 500, 2999):
+			self.assertEqual(b"%c" % (i % 256) * self.sizes[i], ar.open(headers[i]).read())
+
+	def test_file(self):
+		with arpy.Archive(self.path) as ar:
+			self.check_archive(ar)
+
+	def test_mmap(self):
+		with arpy.Archive(self.path, use_mmap=True) as ar:
+			self.check_archive(ar)
+
+	def test_fileobj(self):
+		with arpy.Archive(fileobj=io.BytesIO(self.data)) as ar:
+			self.check_archive(ar)
 
 
 class ArchiveIteration(unittest.TestCase):
 	def test_iteration(self):
-		ar = arpy.Archive(os.path.join(os.path.dirname(__file__), 'normal.ar'))
-		ar_iterator = iter(ar)
-		short = ar_iterator.next()
-		self.assertEqual(b'short', short.header.name)
-		self.assertRaises(StopIteration, ar_iterator.next)
-		ar.close()
+		with arpy.Archive(NORMAL_AR) as ar:
+			ar_iterator = iter(ar)
+			short = ar_iterator.next()
+			self.assertEqual(b'short', short.header.name)
+			self.assertRaises(StopIteration, ar_iterator.next)
 
 if __name__ == "__main__":
 	unittest.main()
@@ -1,45 +1,191 @@
 import arpy
+import io
 import unittest
 import os
+import tempfile
+
+TEST_DIR = os.path.dirname(__file__)
+THIN_AR = os.path.join(TEST_DIR, 'thin.ar')
+THIN_MEMBER_FILE = os.path.join(TEST_DIR, 'CMakeFiles', 'ext_lib_normal.dir', 'ext_lib.c.o')
+
+def make_thin_archive(tmp_dir, contents, create_members=True):
+    """ Write a thin archive of the given members to tmp_dir, return its path """
+    path = os.path.join(tmp_dir, 'thin.a')
+    with open(path, 'wb') as f:
+        f.write(b'!<thin>\n')
+        for name, content in sorted(contents.items()):
+            if create_members:
+                with open(os.path.join(tmp_dir, name.decode()), 'wb') as member:
+                    member.write(content)
+            # the member data lives in its own file only
+            f.write(b'%-16s%-12d%-6d%-6d%-8o%-10d`\n' %
+                    (name + b'/', 0, 0, 0, 0o644, len(content)))
+    return path
 
 # Test thin archive support
 class Thin(unittest.TestCase):
     thin_file_name = b'CMakeFiles/ext_lib_normal.dir/ext_lib.c.o'
-    thin_ar_name = 'thin.ar'
+
+    @classmethod
+    def setUpClass(cls):
+        # shared by the tests which only read the member from its start
+        cls.shared_ar = arpy.Archive(THIN_AR)
+        cls.shared_ar.read_all_headers()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.shared_ar.close()
+
+    def get_shared_entry(self):
+        arpy_entry = self.shared_ar.archived_files[self.thin_file_name]
+        arpy_entry.seek(0)
+        return arpy_entry
+
+    file_content = None
 
     def get_file_content(self):
-        with open(os.path.dirname(__file__)+'/CMakeFiles/ext_lib_normal.dir/ext_lib.c.o','rb') as f:
-            return f.read()
+        cls = type(self)
+        if cls.file_content is None:
+            with open(THIN_MEMBER_FILE, 'rb') as f:
+                cls.file_content = f.read()
+        return cls.file_content
 
     def test_list(self):
-        ar = arpy.Archive(os.path.join(os.path.dirname(__file__), self.thin_ar_name))
-        ar.read_all_headers()
-        self.assertEqual([self.thin_file_name],
-                list(ar.archived_files.keys()))
+        ar = self.shared_ar
+        self.assertEqual({self.thin_file_name},
+                ar.archived_files.keys())
         self.assertEqual(3, len(ar.headers)) # Symbols, GNUtable, archive
-        ar.close()
+
+    def test_list_multiple_members(self):
+        contents = dict((name, b'xxxxx') for name in [b'a.txt', b'b.txt', b'c.txt'])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = make_thin_archive(tmp_dir, contents, create_members=False)
+            with arpy.Archive(path) as ar:
+                self.assertEqual(sorted(contents), ar.namelist())
+                self.assertEqual(3, len(ar.headers))
 
     def test_content(self):
-        ar = arpy.Archive(os.path.join(os.path.dirname(__file__), self.thin_ar_name))
-        ar.read_all_headers()
-        arpy_entry = ar.archived_files[self.thin_file_name]
+        arpy_entry = self.get_shared_entry()
         real_content = self.get_file_content()
         arpy_content = arpy_entry.read()
         self.assertEqual(arpy_content, real_content)
         self.assertEqual(arpy_entry.header.size, len(real_content))
-        ar.close()
 
     def test_content_offset_preserving(self):
-        ar = arpy.Archive(os.path.join(os.path.dirname(__file__), self.thin_ar_name))
-        ar.read_all_headers()
-        arpy_entry = ar.archived_files[self.thin_file_name]
+        arpy_entry = self.get_shared_entry()
         real_content = self.get_file_content()
-        arpy_content = arpy_entry.read(10)
-        arpy_content += arpy_entry.read(20)
-        arpy_content += arpy_entry.read()
+        arpy_content = bytearray(arpy_entry.header.size)
+        view = memoryview(arpy_content)
+        self.assertEqual(10, arpy_entry.readinto(view[:10]))
+        self.assertEqual(20, arpy_entry.readinto(view[10:30]))
+        self.assertEqual(len(view) - 30, arpy_entry.readinto(view[30:]))
+        self.assertEqual(0, arpy_entry.readinto(view))
         self.assertEqual(arpy_content, real_content)
         self.assertEqual(arpy_entry.header.size, len(real_content))
-        ar.close()
+
+    def test_read_size_clamped(self):
+        arpy_entry = self.get_shared_entry()
+        real_content = self.get_file_content()
+        arpy_entry.seek(5)
+        self.assertEqual(real_content[5:], arpy_entry.read(-1))
+        self.assertEqual(len(real_content), arpy_entry.tell())
+        arpy_entry.seek(5)
+        self.assertEqual(real_content[5:], arpy_entry.read(len(real_content)))
+        self.assertEqual(b'', arpy_entry.read(10))
+
+    def test_read_members(self):
+        with arpy.Archive(THIN_AR) as ar:
+            self.assertEqual({self.thin_file_name: self.get_file_content()},
+                    ar.read_members([self.thin_file_name]))
+
+    def test_read_members_parallel(self):
+        contents = {b'a.txt': b'aaaa', b'b.txt': b'bbbbbb', b'c.txt': b'cc'}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with arpy.Archive(make_thin_archive(tmp_dir, contents)) as ar:
+                self.assertEqual(sorted(contents), ar.namelist())
+                self.assertEqual(contents, ar.read_members(sorted(contents), workers=4))
+
+    def test_member_file_closed_when_read(self):
+        contents = dict((b'm%d.txt' % i, b'x' * i) for i in range(1, 4))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with arpy.Archive(make_thin_archive(tmp_dir, contents)) as ar:
+                for arpy_entry in ar:
+                    self.assertEqual(contents[arpy_entry.header.name], arpy_entry.read())
+                    self.assertIsNone(arpy_entry._member_file)
+
+    def test_list_missing_member(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = make_thin_archive(tmp_dir, {b'missing.txt': b'xxxxx'}, create_members=False)
+            with arpy.Archive(path) as ar:
+                ar.read_all_headers()
+                self.assertEqual([b'missing.txt'], ar.namelist())
+                self.assertRaises(OSError, ar.open(b'missing.txt').read)
+                self.assertRaises(OSError, ar.read_members, [b'missing.txt'])
+
+    def test_list_unusable_member_names(self):
+        contents = {b'\xff.txt': b'xxxxx', b'nul\x00.txt': b'xxxxx'}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = make_thin_archive(tmp_dir, contents, create_members=False)
+            with arpy.Archive(path) as ar:
+                self.assertEqual(sorted(contents), ar.namelist())
+                ar._advise_thin_members(ar.infolist())
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), 'needs FIFOs')
+    def test_advise_skips_fifo_member(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = make_thin_archive(tmp_dir, {b'fifo': b'xxxxx'}, create_members=False)
+            os.mkfifo(os.path.join(tmp_dir, 'fifo'))
+            with arpy.Archive(path) as ar:
+                # must not wait for a writer to open the FIFO
+                ar._advise_thin_members(ar.infolist())
+
+    def test_advise_only_read_members(self):
+        contents = {b'a.txt': b'aaaa', b'b.txt': b'bbbbbb'}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with arpy.Archive(make_thin_archive(tmp_dir, contents)) as ar:
+                advised = []
+                ar._advise_thin_members = lambda headers: advised.append(
+                        [header.name for header in headers])
+                ar.infolist()
+                ar.open(b'a.txt').read()
+                self.assertEqual([], advised)
+                ar.read_members([b'b.txt'])
+                self.assertEqual([[b'b.txt']], advised)
+
+    def test_member_file_reused(self):
+        with arpy.Archive(THIN_AR) as ar:
+            arpy_entry = ar.open(self.thin_file_name)
+            arpy_entry.read(10)
+            member_file = arpy_entry._member_file
+            arpy_entry.read(10)
+            self.assertIs(member_file, arpy_entry._member_file)
+        self.assertTrue(member_file.closed)
+
+    def test_member_file_released_by_context(self):
+        with arpy.Archive(THIN_AR) as ar:
+            with ar.open(self.thin_file_name) as arpy_entry:
+                arpy_entry.read(10)
+                member_file = arpy_entry._member_file
+            self.assertTrue(member_file.closed)
+            self.assertEqual(self.get_file_content()[10:20], arpy_entry.read(10))
+
+    def test_relative_archive_name(self):
+        real_content = self.get_file_content()
+        cwd = os.getcwd()
+        os.chdir(TEST_DIR)
+        try:
+            with arpy.Archive('thin.ar') as ar:
+                self.assertEqual(real_content, ar.open(self.thin_file_name).read())
+        finally:
+            os.chdir(cwd)
+
+    def test_fileobj_without_path(self):
+        with open(THIN_AR, 'rb') as f:
+            data = f.read()
+        with arpy.Archive(fileobj=io.BytesIO(data)) as ar:
+            ar.read_all_headers()
+            self.assertEqual([self.thin_file_name], ar.namelist())
+            self.assertRaises(arpy.ArchiveAccessError, ar.open, self.thin_file_name)
 
 if __name__ == "__main__":
 	unittest.main()